@@ -3,52 +3,320 @@
 """
 小说爬虫程序
 使用 Playwright 处理需要 JavaScript 渲染的动态网页，从笔趣阁网站爬取小说内容并保存为 TXT 文件。
+静态网页直接通过 httpx 请求，无需启动浏览器。
 
 功能特点：
 - 自动获取小说名称和章节列表
-- 逐章下载小说内容
+- 并发下载小说章节内容（asyncio + Playwright 异步 API）
 - 保存为 TXT 文件，文件名使用小说名称
 - 支持单页应用（SPA）和动态内容加载
+- 静态网站自动跳过浏览器，直接用 HTTP 请求下载
 
 作者：Auto
 创建时间：2024
 """
 
-from playwright.sync_api import sync_playwright
+from playwright.async_api import async_playwright
+from aiolimiter import AsyncLimiter
+import aiofiles
+import httpx
 from bs4 import BeautifulSoup
-from urllib.parse import urljoin
+import soupsieve as sv
+from urllib.parse import urldefrag, urljoin, urlsplit
+from concurrent.futures import ProcessPoolExecutor
+import asyncio
+import multiprocessing
 import re
-import time
 import os
-from typing import List, Dict, Optional
+import sys
+from typing import AsyncIterator, List, Dict, Optional, Sequence, Tuple, Union
+
+
+# 同时下载的章节数（并发页面数）
+CONCURRENCY = 8
+
+# 每秒最多发起的章节请求数（令牌桶限速）
+RATE_LIMIT = 4
+
+# 还不知道正文选择器时，章节页等待的默认元素
+DEFAULT_CONTENT_WAIT_SELECTOR = '#content, .content, #chaptercontent'
+
+# 浏览器启动参数，关闭爬虫用不到的功能以加快启动
+BROWSER_ARGS = [
+    '--disable-gpu',
+    '--disable-dev-shm-usage',
+    '--disable-extensions',
+    '--disable-background-networking',
+    '--disable-sync',
+    '--no-sandbox',
+    '--blink-settings=imagesEnabled=false',
+]
+
+# 写入小说文件时的缓冲区大小（1 MiB）
+WRITE_BUFFER_SIZE = 1 << 20
+
+# 静态网页直接请求时使用的请求头和超时（秒）
+HTTP_HEADERS = {
+    'User-Agent': ('Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
+                   '(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'),
+}
+HTTP_TIMEOUT = 10
+
+# 保存 Cookie 等会话状态的文件，下次运行时复用；放在用户缓存目录，避免留在项目目录中被提交
+STATE_FILE = os.path.join(os.path.expanduser('~'), '.cache', 'novel_crawler', 'state.json')
+
+# 预编译的正则表达式
+_CHAPTER_URL_RE = re.compile(r'/\d+(?:_\d+)?\.html?', re.I)  # 如: /12345.html, /8_8426.htm
+_CHAPTER_TEXT_RE = re.compile(r'第.*[章节]|^\d+(?:[、.]|\s)')  # 如: 第一章, 第12节, 1、, 1.
+_CONTENT_CLASS_RE = re.compile(r'content|text|chapter|novel|read|book', re.I)
+_TITLE_SUFFIX_RE = re.compile(r'[-_|].*$')
+_TITLE_PREFIX_RE = re.compile(r'^.*?[-_|]')
+_BOOK_ID_RE = re.compile(r'/book/(\d+)/?')
+_BOOK_ID_UNDERSCORE_RE = re.compile(r'/(\d+_\d+)/?')
+_TRAILING_ID_RE = re.compile(r'/(\d+)/?$')
+
+# 小说名称中要排除的文本（网站名称等），按顺序尝试从标题中切除
+_NAME_EXCLUDE_ORDER = ('笔趣阁', '小说', '小说网', '首页', '目录', '章节列表')
+_NAME_EXCLUDES = frozenset(_NAME_EXCLUDE_ORDER)
+
+# 通用搜索时排除的导航链接文本
+_NAV_EXCLUDES = frozenset({'首页', '上一章', '下一章', '目录', '返回', '上一页', '下一页', '加入书架', '推荐', '收藏'})
+
+# 文件名中不允许出现的字符，用 str.translate 删除
+_FN_STRIP = str.maketrans('', '', '<>:"/\\|?*')
+
+# 提取文本时不需要的资源类型，直接拦截不下载
+BLOCKED_RESOURCE_TYPES = frozenset({'image', 'media', 'font', 'stylesheet', 'websocket', 'manifest'})
+
+
+async def _block_resources(route) -> None:
+    """拦截图片、字体、样式等与正文无关的请求"""
+    if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+# 在浏览器内按顺序尝试选择器，只把命中的选择器和足够长的正文文本传回 Python
+_EXTRACT_TEXT_JS = """(selectors) => {
+    for (const selector of selectors) {
+        const el = document.querySelector(selector);
+        if (el) {
+            const text = el.innerText.trim();
+            if (text.length > 200) return {selector, text};
+        }
+    }
+    return null;
+}"""
+
+# 在浏览器内筛选章节链接，只把 (完整URL, 标题) 传回 Python
+_SEARCH_CHAPTERS_JS = """(links, opts) => {
+    const urlRe = new RegExp(opts.urlPattern, 'i');
+    const textRe = new RegExp(opts.textPattern);
+    const excludes = new Set(opts.excludes);
+    const keywords = ['list', 'chapter', 'book', 'content'];
+    const result = [];
+    for (const a of links) {
+        const href = a.getAttribute('href');
+        const text = a.textContent.trim();
+        // 跳过空链接和排除的文本
+        if (!text || excludes.has(text)) continue;
+        // 1. URL模式检查  2. 文本模式检查
+        let isChapter = href.toLowerCase().includes('chapter') || href.includes('/book/')
+            || urlRe.test(href) || textRe.test(text);
+        // 3. 长度和格式检查：链接在章节列表等容器中
+        if (!isChapter && text.length < 50 && text.length > 2 && a.parentElement) {
+            const parent = a.parentElement;
+            const attrs = ((parent.getAttribute('class') || '') + ' ' + (parent.id || '')).toLowerCase();
+            isChapter = keywords.some(keyword => attrs.includes(keyword));
+        }
+        // a.href 由浏览器解析为完整URL
+        if (isChapter) result.push([a.href, text]);
+    }
+    return result;
+}"""
+
+
+# 进程池中各进程自己的选择器编译缓存，每个选择器在每个进程只编译一次
+_CSS_CACHE: Dict[str, sv.SoupSieve] = {}
+
+
+def _compiled_css(selector: str) -> sv.SoupSieve:
+    """返回编译好的选择器"""
+    css = _CSS_CACHE.get(selector)
+    if css is None:
+        css = _CSS_CACHE[selector] = sv.compile(selector)
+    return css
+
+
+def _parse_chapter_html(html: Union[str, bytes], selectors: Sequence[str] = (),
+                        encoding: Optional[str] = None) -> Optional[Tuple[Optional[str], str]]:
+    """
+    从完整HTML中提取正文
+    
+    纯函数，在进程池中执行，避免 HTML 解析阻塞事件循环。
+    
+    :param html: 章节页HTML，bytes 时由解析器根据 encoding 或页面声明解码
+    :param selectors: 依次尝试的正文选择器，为空时只做通用搜索
+    :param encoding: HTTP 响应声明的编码
+    :return: (命中的选择器, 正文文本)，通用搜索找到时选择器为None，未找到返回None
+    """
+    soup = BeautifulSoup(html, 'lxml', from_encoding=encoding)
+    
+    for selector in selectors:
+        content_elem = _compiled_css(selector).select_one(soup)
+        if content_elem:
+            text = content_elem.get_text().strip()
+            if len(text) > 200:  # 内容应该足够长
+                return selector, text
+    
+    # 尝试查找包含大量文本的元素
+    # 优先查找div，然后是其他块级元素
+    elements = soup.find_all(['div', 'article', 'section'], 
+                            class_=_CONTENT_CLASS_RE)
+    
+    # 如果没找到，查找所有div
+    if not elements:
+        elements = soup.find_all('div')
+    
+    for elem in elements:
+        text = elem.get_text().strip()
+        # 内容应该足够长，且不包含太多链接（排除导航区域）
+        links_count = len(elem.find_all('a'))
+        if len(text) > 500 and links_count < 10:  # 内容长且链接少
+            return None, text
+    return None
 
 
 class NovelSpider:
     """小说爬虫类，使用 Playwright 处理动态网页"""
     
-    def __init__(self, book_url: str):
+    # 小说名称选择器，支持更多网站结构
+    TITLE_SELECTORS = (
+        'h1',
+        '.book-title',
+        '#book-title',
+        'title',
+        '.bookname h1',
+        '.bookname',
+        '.book_info h1',
+        '.book_info h2',
+        '.book_con h1',
+        '[class*="book-title"]',
+        '[class*="book-name"]',
+        '[class*="bookname"]',
+        '[id*="bookname"]',
+        '[id*="book-title"]',
+    )
+    _TITLE_CSS = tuple(sv.compile(selector) for selector in TITLE_SELECTORS)
+    
+    # 等待章节列表加载时使用的选择器
+    CHAPTER_WAIT_SELECTORS = (
+        'a[href*="chapter"]',
+        'a[href*="/chapter/"]',
+        '.chapter-list a',
+        '#chapter-list a',
+        'dd a',
+        'dt a',
+        '.list-group-item a',
+        'ul.list a',
+        'div.list a',
+        '.chapter a',
+        '#list a',
+        '.book_list a',
+        'table a',
+    )
+    
+    # 章节链接选择器，支持更多网站结构
+    CHAPTER_SELECTORS = (
+        'a[href*="chapter"]',
+        'a[href*="/chapter/"]',
+        '.chapter-list a',
+        '#chapter-list a',
+        'dd a',                    # 常见的小说网站结构
+        'dt a',                    # 有些网站用dt标签
+        '.list-group-item a',
+        'ul.list a',
+        'div.list a',
+        '.chapter a',
+        '#list a',                 # 章节列表容器
+        '.book_list a',            # 书籍列表
+        '.chapter_list a',         # 章节列表
+        'table a',                 # 表格中的链接
+        'tbody a',                 # 表格体中的链接
+        '.listmain dd a',          # 常见结构
+        '.listmain dt a',
+        '#list dd a',
+        '#list dt a',
+    )
+    _CHAPTER_CSS = tuple(sv.compile(selector) for selector in CHAPTER_SELECTORS)
+    
+    # 正文内容选择器，支持更多网站结构
+    CONTENT_SELECTORS = (
+        '#content',
+        '.content',
+        '#chaptercontent',
+        '.chapter-content',
+        '#novelcontent',
+        '.text-content',
+        '#text',
+        '.chaptercontent',
+        '.bookcontent',
+        '#bookcontent',
+        '.novelcontent',
+        '[id*="content"]',
+        '[class*="content"]',
+        '[id*="text"]',
+        '[class*="text"]',
+        '[id*="chapter"]',
+        '[class*="chapter"]',
+        '.readcontent',
+        '#readcontent',
+    )
+    
+    def __init__(self, book_url: str, concurrency: int = CONCURRENCY):
         """
         初始化爬虫
         
         :param book_url: 小说主页URL，例如: https://www.57389b.sbs/#/book/1233/
+        :param concurrency: 同时下载的章节数，默认为 CONCURRENCY
         """
         self.book_url = book_url
+        self.concurrency = concurrency
         self.novel_name = ""
         self.chapters: List[Dict[str, str]] = []
         self.playwright = None
         self.browser = None
+        self.context = None
         self.page = None
+        # 下载章节时复用的页面，数量等于并发数
+        self._page_pool: List = []
+        # 静态网站使用的 HTTP 客户端，为 None 时使用浏览器
+        self.client: Optional[httpx.AsyncClient] = None
+        # 同一网站的章节页结构相同，记住上次命中的正文选择器
+        self._winning_content_selector: Optional[str] = None
+        # 回退解析用的进程池，首次需要时创建
+        self._parse_pool: Optional[ProcessPoolExecutor] = None
+        # 静态探测时已下载的章节内容 {URL: 内容}，下载时直接复用
+        self._prefetched: Dict[str, str] = {}
         
-    def init_browser(self) -> bool:
+    async def init_browser(self) -> bool:
         """
         初始化浏览器
         
         :return: 初始化是否成功
         """
         try:
-            self.playwright = sync_playwright().start()
-            self.browser = self.playwright.chromium.launch(headless=True)
-            self.page = self.browser.new_page()
+            self.playwright = await async_playwright().start()
+            self.browser = await self.playwright.chromium.launch(headless=True, args=BROWSER_ARGS)
+            # 所有页面共享同一个上下文（Cookie、缓存），并复用上次保存的会话状态
+            self.context = await self.browser.new_context(
+                java_script_enabled=True,
+                bypass_csp=True,
+                storage_state=STATE_FILE if os.path.exists(STATE_FILE) else None,
+            )
+            await self.context.route('**/*', _block_resources)
+            self.page = await self.context.new_page()
             return True
         except Exception as e:
             print(f"❌ 初始化浏览器失败: {e}")
@@ -57,43 +325,45 @@ class NovelSpider:
             print("  playwright install chromium")
             return False
     
-    def get_novel_info(self) -> bool:
+    async def get_novel_info(self) -> bool:
         """
         获取小说信息和章节列表
         
         :return: 是否成功获取
         """
-        if not self.init_browser():
+        print("📖 正在获取小说信息...")
+        
+        # 先尝试直接请求静态HTML，成功则不启动浏览器
+        # 带 # 路由的单页应用，HTTP 请求不会携带片段，只能用浏览器
+        if not urlsplit(self.book_url).fragment and await self._get_novel_info_static():
+            return True
+        
+        if not await self.init_browser():
             return False
         
-        print("📖 正在获取小说信息...")
         try:
             # 访问小说主页
-            self.page.goto(self.book_url, wait_until='networkidle', timeout=30000)
-            time.sleep(3)  # 等待页面完全加载
+            # 只等待 DOM 解析完成，章节列表由 _wait_for_chapters 等待
+            await self.page.goto(self.book_url, wait_until='domcontentloaded', timeout=30000)
+            
+            # 等待章节列表加载
+            await self._wait_for_chapters()
             
-            # 获取页面源码
-            page_content = self.page.content()
-            soup = BeautifulSoup(page_content, 'html.parser')
+            # 获取页面源码，只解析一次，名称和章节共用
+            page_content = await self.page.content()
+            soup = BeautifulSoup(page_content, 'lxml')
             
             # 获取小说名称
             self._extract_novel_name(soup)
             print(f"📚 小说名称: {self.novel_name}")
             
-            # 等待章节列表加载
-            self._wait_for_chapters()
-            
-            # 重新获取页面内容（可能在等待后更新了）
-            page_content = self.page.content()
-            soup = BeautifulSoup(page_content, 'html.parser')
-            
             # 提取章节列表
-            if self._extract_chapters(soup):
+            if await self._extract_chapters(soup):
                 print(f"✅ 找到 {len(self.chapters)} 个章节")
                 return True
             else:
                 print("❌ 未找到章节列表")
-                print(f"   页面标题: {self.page.title()}")
+                print(f"   页面标题: {await self.page.title()}")
                 return False
                 
         except Exception as e:
@@ -102,325 +372,289 @@ class NovelSpider:
             traceback.print_exc()
             return False
     
+    async def _get_novel_info_static(self) -> bool:
+        """
+        直接请求小说主页HTML并提取信息，适用于无需 JavaScript 渲染的静态网站
+        
+        :return: 是否成功获取（目录页和第一章都能直接解析）；失败时关闭 HTTP 客户端，由浏览器接手
+        """
+        self.client = httpx.AsyncClient(headers=HTTP_HEADERS, timeout=HTTP_TIMEOUT, follow_redirects=True)
+        try:
+            resp = await self.client.get(self.book_url)
+            resp.raise_for_status()
+            soup = BeautifulSoup(resp.content, 'lxml', from_encoding=resp.charset_encoding)
+            
+            chapters_by_url = self._select_chapters(soup, str(resp.url))
+            if chapters_by_url and len(chapters_by_url) >= 3:
+                # 目录页是静态的不代表章节页也是，先试下载第一章
+                first_url = next(iter(chapters_by_url))
+                first_content = await self._get_chapter_content_static(first_url)
+                if not first_content:
+                    raise ValueError("章节页需要 JavaScript 渲染")
+                self._prefetched[first_url] = first_content
+                
+                self._extract_novel_name(soup)
+                print(f"📚 小说名称: {self.novel_name}")
+                self.chapters = [{'title': title, 'url': url} for url, title in chapters_by_url.items()]
+                print(f"✅ 找到 {len(self.chapters)} 个章节（静态页面，无需启动浏览器）")
+                return True
+        except Exception as e:
+            print(f"   直接请求失败: {e}")
+        
+        # 页面需要 JavaScript 渲染（如单页应用），改用浏览器
+        await self.client.aclose()
+        self.client = None
+        self._winning_content_selector = None
+        return False
+    
     def _extract_novel_name(self, soup: BeautifulSoup) -> None:
         """从页面中提取小说名称"""
-        # 扩展的选择器列表，支持更多网站结构
-        title_selectors = [
-            'h1',
-            '.book-title',
-            '#book-title',
-            'title',
-            '.bookname h1',
-            '.bookname',
-            '.book_info h1',
-            '.book_info h2',
-            '.book_con h1',
-            '[class*="book-title"]',
-            '[class*="book-name"]',
-            '[class*="bookname"]',
-            '[id*="bookname"]',
-            '[id*="book-title"]',
-        ]
-        
-        # 排除的文本（网站名称等）
-        exclude_texts = ['笔趣阁', '小说', '小说网', '首页', '目录', '章节列表']
-        
-        for selector in title_selectors:
-            title_elem = soup.select_one(selector)
+        for css in self._TITLE_CSS:
+            title_elem = css.select_one(soup)
             if title_elem:
                 title_text = title_elem.get_text().strip()
                 # 过滤掉网站名称和无关文本
-                if title_text and title_text not in exclude_texts and len(title_text) > 1:
+                if title_text and title_text not in _NAME_EXCLUDES and len(title_text) > 1:
                     # 如果包含网站名称，尝试提取书名部分
-                    for exclude in exclude_texts:
+                    for exclude in _NAME_EXCLUDE_ORDER:
                         if exclude in title_text:
                             parts = title_text.split(exclude)
                             title_text = parts[0].strip() if parts[0].strip() else (parts[1].strip() if len(parts) > 1 else title_text)
                             break
                     
-                    if title_text and title_text not in exclude_texts:
+                    if title_text and title_text not in _NAME_EXCLUDES:
                         self.novel_name = title_text
-                        self.novel_name = re.sub(r'[<>:"/\\|?*]', '', self.novel_name)
+                        self.novel_name = self.novel_name.translate(_FN_STRIP)
                         break
         
         # 如果还没找到，从title标签提取
-        if not self.novel_name or self.novel_name in exclude_texts:
+        if not self.novel_name or self.novel_name in _NAME_EXCLUDES:
             title_tag = soup.find('title')
             if title_tag:
                 title_text = title_tag.get_text().strip()
                 # 尝试提取书名（通常在title的前面部分）
                 # 移除常见的分隔符和网站名称
-                title_text = re.sub(r'[-_|].*$', '', title_text)  # 移除分隔符后的内容
-                title_text = re.sub(r'^.*?[-_|]', '', title_text)  # 移除分隔符前的内容（如果前面是网站名）
+                title_text = _TITLE_SUFFIX_RE.sub('', title_text)  # 移除分隔符后的内容
+                title_text = _TITLE_PREFIX_RE.sub('', title_text)  # 移除分隔符前的内容（如果前面是网站名）
                 
                 parts = title_text.replace('_', ' ').replace('-', ' ').replace('|', ' ').split()
                 for part in parts:
-                    if part and part not in exclude_texts and len(part) > 1:
+                    if part and part not in _NAME_EXCLUDES and len(part) > 1:
                         self.novel_name = part
                         break
-                self.novel_name = re.sub(r'[<>:"/\\|?*]', '', str(self.novel_name))
+                self.novel_name = str(self.novel_name).translate(_FN_STRIP)
         
         # 如果还是没找到，使用默认名称（从URL提取）
-        if not self.novel_name or self.novel_name in exclude_texts:
+        if not self.novel_name or self.novel_name in _NAME_EXCLUDES:
             # 尝试多种URL格式
-            book_id_match = re.search(r'/book/(\d+)/?', self.book_url) or \
-                           re.search(r'/(\d+_\d+)/?', self.book_url) or \
-                           re.search(r'/(\d+)/?$', self.book_url.split('/')[-2] if '/' in self.book_url else '')
+            book_id_match = _BOOK_ID_RE.search(self.book_url) or \
+                           _BOOK_ID_UNDERSCORE_RE.search(self.book_url) or \
+                           _TRAILING_ID_RE.search(self.book_url.split('/')[-2] if '/' in self.book_url else '')
             if book_id_match:
                 book_id = book_id_match.group(1) if hasattr(book_id_match, 'group') else str(book_id_match)
                 self.novel_name = f"小说_{book_id}"
     
-    def _wait_for_chapters(self) -> None:
+    async def _wait_for_chapters(self) -> None:
         """等待章节列表加载"""
-        # 扩展的选择器，支持更多网站结构
-        selectors = [
-            'a[href*="chapter"]',
-            'a[href*="/chapter/"]',
-            '.chapter-list a',
-            '#chapter-list a',
-            'dd a',
-            'dt a',
-            '.list-group-item a',
-            'ul.list a',
-            'div.list a',
-            '.chapter a',
-            '#list a',
-            '.book_list a',
-            'table a',
-        ]
-        
-        for selector in selectors:
+        for selector in self.CHAPTER_WAIT_SELECTORS:
             try:
-                self.page.wait_for_selector(selector, timeout=3000)
+                await self.page.wait_for_selector(selector, timeout=3000)
                 break  # 找到就退出
             except:
                 continue  # 继续尝试下一个
     
-    def _extract_chapters(self, soup: BeautifulSoup) -> bool:
-        """从页面中提取章节列表"""
-        # 扩展的选择器列表，支持更多网站结构
-        chapter_selectors = [
-            'a[href*="chapter"]',
-            'a[href*="/chapter/"]',
-            '.chapter-list a',
-            '#chapter-list a',
-            'dd a',                    # 常见的小说网站结构
-            'dt a',                    # 有些网站用dt标签
-            '.list-group-item a',
-            'ul.list a',
-            'div.list a',
-            '.chapter a',
-            '#list a',                 # 章节列表容器
-            '.book_list a',            # 书籍列表
-            '.chapter_list a',         # 章节列表
-            'table a',                 # 表格中的链接
-            'tbody a',                 # 表格体中的链接
-            '.listmain dd a',          # 常见结构
-            '.listmain dt a',
-            '#list dd a',
-            '#list dt a',
-        ]
-        
-        chapter_links = []
-        for selector in chapter_selectors:
-            links = soup.select(selector)
+    def _select_chapters(self, soup: BeautifulSoup, base_url: str) -> Optional[Dict[str, str]]:
+        """
+        使用章节选择器提取章节链接
+        
+        :param soup: 目录页
+        :param base_url: 用于拼接相对链接的页面URL
+        :return: 按URL去重的 {URL: 标题}，没有选择器命中时返回None
+        """
+        # 按URL去重，dict 保持插入顺序，保留第一次出现的标题
+        # 先检查URL是否已出现，重复的链接（如"最新章节"区块）不再提取标题
+        chapters_by_url: Dict[str, str] = {}
+        for css in self._CHAPTER_CSS:
+            links = css.select(soup)
             if links and len(links) > 3:  # 至少3个链接才认为是章节列表
-                chapter_links = links
-                print(f"   使用选择器 '{selector}' 找到 {len(links)} 个章节")
-                break
+                for link in links:
+                    href = link.get('href', '')
+                    if not href:
+                        continue
+                    url = urljoin(base_url, href)
+                    if url in chapters_by_url:
+                        continue
+                    title = link.get_text().strip()
+                    if title:
+                        chapters_by_url[url] = sys.intern(title)
+                print(f"   使用选择器 '{css.pattern}' 找到 {len(links)} 个章节")
+                return chapters_by_url
+        return None
+    
+    async def _extract_chapters(self, soup: BeautifulSoup) -> bool:
+        """从页面中提取章节列表"""
+        chapters_by_url = self._select_chapters(soup, self.page.url)
         
         # 如果特定选择器没找到，使用通用搜索
-        if not chapter_links:
-            chapter_links = self._search_chapters_generic(soup)
-        
-        # 去重并提取章节信息
-        seen_urls = set()
-        base_url = self.page.url.split('#')[0]
-        
-        for item in chapter_links:
-            if isinstance(item, dict):
-                url = item.get('url', '')
-                title = item.get('title', '')
-            else:
-                url = item.get('href', '')
-                title = item.get_text().strip()
-                if not url.startswith('http'):
-                    if url.startswith('/'):
-                        url = base_url.rstrip('/') + url
-                    else:
-                        url = base_url.rstrip('/') + '/' + url
-            
-            if url and title and url not in seen_urls:
-                seen_urls.add(url)
-                self.chapters.append({
-                    'title': title,
-                    'url': url
-                })
+        if chapters_by_url is None:
+            chapters_by_url = {}
+            for url, title in await self._search_chapters_generic():
+                if url and title and url not in chapters_by_url:
+                    chapters_by_url[url] = sys.intern(title)
         
+        self.chapters = [{'title': title, 'url': url} for url, title in chapters_by_url.items()]
         return len(self.chapters) > 0
     
-    def _search_chapters_generic(self, soup: BeautifulSoup) -> List:
-        """通用方法搜索章节链接"""
-        all_links = soup.find_all('a', href=True)
-        base_url = self.page.url.split('#')[0]
-        # 处理基础URL，确保有协议
-        if not base_url.startswith('http'):
-            base_url = self.book_url.split('#')[0]
-        
-        chapter_links = []
-        exclude_texts = ['首页', '上一章', '下一章', '目录', '返回', '上一页', '下一页', '加入书架', '推荐', '收藏']
-        
-        for link in all_links:
-            href = link.get('href', '')
-            text = link.get_text().strip()
-            
-            # 跳过空链接和排除的文本
-            if not text or text in exclude_texts:
-                continue
-            
-            # 检查是否是章节链接的多种模式
-            is_chapter = False
-            
-            # 1. URL模式检查
-            if (
-                'chapter' in href.lower() or
-                '/book/' in href or
-                re.search(r'/\d+\.html', href) or
-                re.search(r'/\d+_\d+\.html', href) or  # 如: 8_8426/12345.html
-                re.search(r'/\d+/\d+\.html', href) or  # 如: 8/8426/12345.html
-                re.search(r'/\d+/\d+\.htm', href) or
-                re.search(r'chapter/\d+', href, re.I) or
-                re.search(r'/\d+\.htm', href)
-            ):
-                is_chapter = True
-            
-            # 2. 文本模式检查
-            if (
-                re.search(r'第.*章', text) or
-                re.search(r'第.*节', text) or
-                re.search(r'^\d+[、.]', text) or
-                re.search(r'^\d+\s+', text) or
-                re.search(r'第\d+章', text) or
-                re.search(r'第\d+节', text)
-            ):
-                is_chapter = True
-            
-            # 3. 长度和格式检查（排除导航链接）
-            if not is_chapter and len(text) < 50 and len(text) > 2:
-                # 如果链接在特定的容器中（如章节列表区域）
-                parent = link.parent
-                if parent:
-                    parent_class = parent.get('class', [])
-                    parent_id = parent.get('id', '')
-                    if any(keyword in str(parent_class).lower() or keyword in parent_id.lower() 
-                           for keyword in ['list', 'chapter', 'book', 'content']):
-                        is_chapter = True
-            
-            if is_chapter:
-                # 构建完整URL
-                if not href.startswith('http'):
-                    if href.startswith('/'):
-                        href = base_url.rstrip('/') + href
-                    elif href.startswith('./') or href.startswith('../'):
-                        # 处理相对路径
-                        href = urljoin(base_url, href)
-                    else:
-                        # 相对路径，需要拼接
-                        if base_url.endswith('/'):
-                            href = base_url + href
-                        else:
-                            href = base_url + '/' + href
-                
-                chapter_links.append({
-                    'title': text,
-                    'url': href,
-                    'element': link
-                })
+    async def _search_chapters_generic(self) -> List[Tuple[str, str]]:
+        """通用方法搜索章节链接，筛选在浏览器内完成"""
+        chapter_links = await self.page.eval_on_selector_all('a[href]', _SEARCH_CHAPTERS_JS, {
+            'urlPattern': _CHAPTER_URL_RE.pattern,
+            'textPattern': _CHAPTER_TEXT_RE.pattern,
+            'excludes': list(_NAV_EXCLUDES),
+        })
         
         if chapter_links:
             print(f"   通过通用搜索找到 {len(chapter_links)} 个可能的章节链接")
         
         return chapter_links
     
-    def get_chapter_content(self, chapter_url: str) -> Optional[str]:
+    async def get_chapter_content(self, chapter_url: str, page=None) -> Optional[str]:
         """
         获取章节内容
         
         :param chapter_url: 章节URL
+        :param page: 用于加载章节的页面，默认使用 self.page
         :return: 章节内容文本，失败返回None
         """
+        if self.client is not None:
+            # 探测时已下载过的章节不再重复请求
+            if chapter_url in self._prefetched:
+                return self._prefetched.pop(chapter_url)
+            return await self._get_chapter_content_static(chapter_url)
+        
+        page = page or self.page
         try:
-            self.page.goto(chapter_url, wait_until='networkidle', timeout=20000)
-            time.sleep(1)  # 等待内容加载
-            
-            page_content = self.page.content()
-            soup = BeautifulSoup(page_content, 'html.parser')
-            
-            # 扩展的内容选择器，支持更多网站结构
-            content_selectors = [
-                '#content',
-                '.content',
-                '#chaptercontent',
-                '.chapter-content',
-                '#novelcontent',
-                '.text-content',
-                '#text',
-                '#chaptercontent',
-                '.chaptercontent',
-                '.bookcontent',
-                '#bookcontent',
-                '.novelcontent',
-                '#novelcontent',
-                '[id*="content"]',
-                '[class*="content"]',
-                '[id*="text"]',
-                '[class*="text"]',
-                '[id*="chapter"]',
-                '[class*="chapter"]',
-                '.readcontent',
-                '#readcontent',
-            ]
+            # 复用的页面如果只改变 # 片段（单页应用路由），goto 不会重新加载文档，
+            # DOM 里还是上一章的内容；先切到空白页，强制完整加载
+            if urlsplit(chapter_url).fragment and urldefrag(page.url)[0] == urldefrag(chapter_url)[0]:
+                await page.goto('about:blank')
+            await page.goto(chapter_url, wait_until='domcontentloaded', timeout=20000)
+            # 等待正文元素出现，已记住命中的选择器时只等待它；没有匹配时继续走下面的回退逻辑
+            wait_selector = self._winning_content_selector or DEFAULT_CONTENT_WAIT_SELECTOR
+            try:
+                await page.wait_for_selector(wait_selector, timeout=5000)
+            except Exception:
+                pass
             
+            # 在浏览器内提取正文，避免序列化整个 DOM 再解析
             content = None
-            for selector in content_selectors:
-                content_elem = soup.select_one(selector)
-                if content_elem:
-                    text = content_elem.get_text().strip()
-                    if len(text) > 200:  # 内容应该足够长
-                        content = text
-                        break
+            result = await page.evaluate(_EXTRACT_TEXT_JS, self._content_selectors())
+            if result:
+                content = result['text']
+                self._winning_content_selector = result['selector']
             
-            # 如果特定选择器没找到，使用通用搜索
+            # 如果特定选择器没找到，在进程池中解析完整HTML进行通用搜索，
+            # 解析期间其他章节的下载继续进行
             if not content:
-                # 尝试查找包含大量文本的元素
-                # 优先查找div，然后是其他块级元素
-                elements = soup.find_all(['div', 'article', 'section'], 
-                                        class_=re.compile(r'content|text|chapter|novel|read|book', re.I))
-                
-                # 如果没找到，查找所有div
-                if not elements:
-                    elements = soup.find_all('div')
-                
-                for elem in elements:
-                    text = elem.get_text().strip()
-                    # 内容应该足够长，且不包含太多链接（排除导航区域）
-                    links_count = len(elem.find_all('a'))
-                    if len(text) > 500 and links_count < 10:  # 内容长且链接少
-                        content = text
-                        break
+                page_content = await page.content()
+                result = await self._parse_html(page_content)
+                if result:
+                    content = result[1]
             
             if content:
-                # 清理内容
-                content = re.sub(r'\s+', '\n', content)
-                content = re.sub(r'\n{3,}', '\n\n', content)  # 多个换行替换为两个
-                content = content.strip()
+                # 清理内容：每段连续空白替换为一个换行，并去掉首尾空白（一次遍历）
+                content = '\n'.join(content.split())
             
             return content
         except Exception as e:
             print(f"   获取章节内容失败: {e}")
             return None
     
-    def save_novel(self, output_dir: str = 'novels') -> bool:
+    async def _get_chapter_content_static(self, chapter_url: str) -> Optional[str]:
+        """
+        通过 HTTP 直接获取静态章节页内容
+        
+        :param chapter_url: 章节URL
+        :return: 章节内容文本，失败返回None
+        """
+        try:
+            resp = await self.client.get(chapter_url)
+            resp.raise_for_status()
+            result = await self._parse_html(resp.content, self._content_selectors(), resp.charset_encoding)
+            if not result:
+                return None
+            
+            selector, content = result
+            if selector:
+                self._winning_content_selector = selector
+            # 清理内容：每段连续空白替换为一个换行，并去掉首尾空白（一次遍历）
+            return '\n'.join(content.split())
+        except Exception as e:
+            print(f"   获取章节内容失败: {e}")
+            return None
+    
+    def _content_selectors(self) -> List[str]:
+        """正文选择器列表，上次命中的选择器排在最前"""
+        winner = self._winning_content_selector
+        if winner:
+            return [winner] + [s for s in self.CONTENT_SELECTORS if s != winner]
+        return list(self.CONTENT_SELECTORS)
+    
+    async def _parse_html(self, html: Union[str, bytes], selectors: Sequence[str] = (),
+                          encoding: Optional[str] = None) -> Optional[Tuple[Optional[str], str]]:
+        """在进程池中解析章节HTML，首次调用时创建进程池"""
+        if self._parse_pool is None:
+            # 此时进程里已有事件循环的线程，fork 可能导致子进程死锁，改用 spawn 启动
+            self._parse_pool = ProcessPoolExecutor(mp_context=multiprocessing.get_context('spawn'))
+        return await asyncio.get_running_loop().run_in_executor(
+            self._parse_pool, _parse_chapter_html, html, selectors, encoding)
+    
+    async def _fetch_chapters(self) -> AsyncIterator[Tuple[Dict[str, str], Optional[str]]]:
+        """
+        并发下载所有章节内容，按章节顺序逐个产出
+        
+        :return: 异步迭代 (章节, 内容)，失败的章节内容为None
+        """
+        semaphore = asyncio.Semaphore(self.concurrency)
+        # 限速，避免请求过快
+        limiter = AsyncLimiter(RATE_LIMIT, 1.0)
+        total = len(self.chapters)
+        
+        # 页面池：预先创建固定数量的页面，各章节轮流使用
+        if self.client is None and not self._page_pool:
+            self._page_pool = [await self.context.new_page() for _ in range(self.concurrency)]
+        pages: asyncio.Queue = asyncio.Queue()
+        for page in self._page_pool:
+            pages.put_nowait(page)
+        
+        async def bounded_fetch(idx: int, chapter: Dict[str, str]) -> Optional[str]:
+            async with semaphore:
+                # 静态网站不需要浏览器页面
+                page = await pages.get() if self.client is None else None
+                try:
+                    async with limiter:
+                        content = await self.get_chapter_content(chapter['url'], page)
+                    print(f"   [{idx}/{total}] {chapter['title']}")
+                    return content
+                finally:
+                    if page is not None:
+                        pages.put_nowait(page)
+        
+        tasks = [asyncio.create_task(bounded_fetch(idx, chapter))
+                 for idx, chapter in enumerate(self.chapters, 1)]
+        try:
+            # 按顺序等待，前面的章节完成后立即交给调用方写入，不必等全部下载完
+            for chapter, task in zip(self.chapters, tasks):
+                try:
+                    content = await task
+                except Exception:
+                    content = None
+                yield chapter, content
+        finally:
+            for task in tasks:
+                task.cancel()
+    
+    async def save_novel(self, output_dir: str = 'novels') -> bool:
         """
         保存小说到txt文件
         
@@ -432,8 +666,7 @@ class NovelSpider:
             return False
         
         # 创建输出目录
-        if not os.path.exists(output_dir):
-            os.makedirs(output_dir)
+        os.makedirs(output_dir, exist_ok=True)
         
         filename = os.path.join(output_dir, f"{self.novel_name}.txt")
         
@@ -441,51 +674,59 @@ class NovelSpider:
         print(f"   保存路径: {filename}")
         
         try:
-            with open(filename, 'w', encoding='utf-8') as f:
+            # 异步写入，避免阻塞事件循环
+            async with aiofiles.open(filename, 'w', encoding='utf-8', buffering=WRITE_BUFFER_SIZE) as f:
                 # 写入小说标题
-                f.write(f"{self.novel_name}\n\n")
-                f.write("=" * 50 + "\n\n")
+                await f.write(f"{self.novel_name}\n\n" + "=" * 50 + "\n\n")
                 
-                # 遍历所有章节
-                total = len(self.chapters)
-                for idx, chapter in enumerate(self.chapters, 1):
-                    print(f"   [{idx}/{total}] {chapter['title']}")
-                    
-                    # 写入章节标题
-                    f.write(f"\n\n{chapter['title']}\n\n")
-                    
-                    # 获取章节内容
-                    content = self.get_chapter_content(chapter['url'])
-                    if content:
-                        f.write(content)
-                        f.write("\n")
-                    else:
-                        f.write("[内容获取失败]\n")
-                    
-                    # 延迟，避免请求过快
-                    time.sleep(0.5)
+                # 并发下载，按章节顺序边下载边写入
+                async for chapter, content in self._fetch_chapters():
+                    # 章节标题和内容一次写入
+                    await f.write(f"\n\n{chapter['title']}\n\n{content or '[内容获取失败]'}\n")
             
             print(f"\n✅ 下载完成！文件已保存到: {filename}")
             return True
         except Exception as e:
             print(f"❌ 保存文件时出错: {e}")
             return False
-        finally:
-            # 清理资源
-            self._cleanup()
     
-    def _cleanup(self) -> None:
-        """清理浏览器资源"""
+    async def _cleanup(self) -> None:
+        """清理浏览器、HTTP 客户端和进程池资源"""
+        if self._parse_pool is not None:
+            self._parse_pool.shutdown()
+            self._parse_pool = None
+        
+        try:
+            if self.client is not None:
+                await self.client.aclose()
+        except:
+            pass
+        
+        try:
+            for page in self._page_pool:
+                await page.close()
+        except:
+            pass
+        self._page_pool = []
+        
+        # 保存会话状态，供下次运行复用
+        try:
+            if self.context:
+                os.makedirs(os.path.dirname(STATE_FILE), exist_ok=True)
+                await self.context.storage_state(path=STATE_FILE)
+        except:
+            pass
+        
         try:
             if self.browser:
-                self.browser.close()
+                await self.browser.close()
             if self.playwright:
-                self.playwright.stop()
+                await self.playwright.stop()
         except:
             pass
 
 
-def main():
+async def main():
     """主函数"""
     # 配置小说URL（可以修改为其他小说）
     # 支持多种网站格式：
@@ -502,20 +743,24 @@ def main():
     # 创建爬虫实例
     spider = NovelSpider(book_url)
     
-    # 获取小说信息并保存
-    if spider.get_novel_info():
-        spider.save_novel()
-    else:
-        print("\n❌ 获取小说信息失败")
-        print("\n可能的原因：")
-        print("  1. 网络连接问题")
-        print("  2. URL不正确")
-        print("  3. 网站结构发生变化")
-        print("  4. 需要登录或验证")
-        print("\n提示：")
-        print("  - 确保URL是小说目录页（包含章节列表的页面）")
-        print("  - 可以尝试在浏览器中打开URL，确认页面正常显示")
+    try:
+        # 获取小说信息并保存
+        if await spider.get_novel_info():
+            await spider.save_novel()
+        else:
+            print("\n❌ 获取小说信息失败")
+            print("\n可能的原因：")
+            print("  1. 网络连接问题")
+            print("  2. URL不正确")
+            print("  3. 网站结构发生变化")
+            print("  4. 需要登录或验证")
+            print("\n提示：")
+            print("  - 确保URL是小说目录页（包含章节列表的页面）")
+            print("  - 可以尝试在浏览器中打开URL，确认页面正常显示")
+    finally:
+        # 无论成功与否都清理资源
+        await spider._cleanup()
 
 
 if __name__ == '__main__':
-    main()
+    asyncio.run(main())